@@ -1,36 +1,61 @@
 from __future__ import annotations
 
+import atexit
+import os
+import re
+import selectors
+import shlex
+import shutil
+import signal
 import subprocess
 import threading
 import time
-from collections import deque
+import weakref
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Deque, Dict, List, Literal, Optional, Tuple
+from typing import IO, Dict, List, Literal, Optional, TextIO, Tuple, Union
 
 
 JobStatus = Literal["running", "done", "error", "canceled"]
 JobKind = Literal["tail", "bash"]
 
+_READ_CHUNK_BYTES = 65536
+# How long process exit waits for readers to drain (a detached grandchild may hold the pipe).
+_READER_DRAIN_TIMEOUT_S = 1.0
+# Exit polling interval for processes without a pidfd (non-Linux or old kernels).
+_EXIT_POLL_INTERVAL_S = 0.05
+# Anything the shell would interpret (pipes, redirects, globs, quoting, expansion, comments...).
+_SHELL_METACHARS_RE = re.compile(r"[|&;<>()$`\\\"'*?~\[\]{}#!\n]")
+# Grace period between SIGTERM and SIGKILL when stopping a bash job.
+_STOP_GRACE_S = 2.0
+# Windows cannot select() on pipes, so it keeps the thread-per-pipe readers.
+_SELECTOR_IO = os.name != "nt"
 
-@dataclass
+
+@dataclass(slots=True)
 class OutputEvent:
     seq: int
     stream: str
     text: str
+    text_len: int = 0
+    # Poll-ready {"seq", "stream", "text"} dict, built once at append time.
+    payload: Optional[dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AsyncJob:
     id: str
     kind: JobKind
     created_at: float
     status: JobStatus = "running"
-    last_update_at: float = field(default_factory=time.time)
+    last_update_at: int = field(default_factory=time.monotonic_ns)
     error: Optional[str] = None
+    # Guards status/error and the event ring; the manager lock only guards the job table.
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
-    # Output storage (bounded).
-    _events: Deque[OutputEvent] = field(default_factory=deque)
+    # Output storage (bounded ring buffer; seq N lives at slot (N - 1) % capacity).
+    _ring: List[Optional[OutputEvent]] = field(default_factory=list)
+    _ring_head_seq: int = 1
     _event_chars: int = 0
     _next_seq: int = 1
 
@@ -38,18 +63,51 @@ class AsyncJob:
     tail_path: Optional[Path] = None
     tail_offset: int = 0
     tail_encoding: str = "utf-8"
+    tail_mtime_ns: int = 0
+    tail_fp: Optional[TextIO] = None
+    tail_inode: int = 0
+    # Trailing partial line held back until its newline arrives.
+    tail_residual: str = ""
 
     proc: Optional[subprocess.Popen] = None
     proc_cwd: Optional[Path] = None
 
 
+@dataclass(slots=True)
+class _BashIO:
+    """I/O-thread bookkeeping for one bash job."""
+
+    job_id: str
+    proc: subprocess.Popen
+    open_streams: int = 0
+    pidfd: Optional[int] = None
+    exit_code: Optional[int] = None
+    drain_deadline: float = 0.0
+    finished: bool = False
+
+
+@dataclass(slots=True)
+class _PipeIO:
+    owner: _BashIO
+    stream: str
+    pipe: IO[bytes]
+    pending: bytes = b""
+
+
 class AsyncJobManager:
     def __init__(self, *, max_events: int = 500, max_event_chars: int = 50_000) -> None:
         self._lock = threading.Lock()
         self._counter = 1
         self._jobs: Dict[str, AsyncJob] = {}
-        self._max_events = int(max_events)
+        self._max_events = max(1, int(max_events))
         self._max_event_chars = int(max_event_chars)
+        # One lazily started thread multiplexes every bash job's pipes and exit.
+        self._io_lock = threading.Lock()
+        self._io_thread: Optional[threading.Thread] = None
+        self._io_selector: Optional[selectors.BaseSelector] = None
+        self._io_wakeup_fd: Optional[int] = None
+        self._io_pending: List[Tuple[str, subprocess.Popen]] = []
+        _MANAGERS.add(self)
 
     def _new_id(self) -> str:
         with self._lock:
@@ -72,10 +130,13 @@ class AsyncJobManager:
         job = AsyncJob(id=job_id, kind="tail", created_at=created_at, tail_path=path, tail_encoding=encoding)
 
         try:
-            stat_size = path.stat().st_size
+            st = path.stat()
         except OSError:
-            stat_size = 0
+            st = None
+        stat_size = st.st_size if st is not None else 0
         job.tail_offset = 0 if start_at == "start" else int(stat_size)
+        if start_at == "end" and st is not None:
+            job.tail_mtime_ns = st.st_mtime_ns
 
         with self._lock:
             self._jobs[job_id] = job
@@ -87,15 +148,16 @@ class AsyncJobManager:
         job = AsyncJob(id=job_id, kind="bash", created_at=created_at, proc_cwd=cwd)
 
         try:
+            argv = _direct_argv(command)
             proc = subprocess.Popen(
-                command,
-                shell=True,
+                argv if argv is not None else command,
+                shell=argv is None,
                 cwd=cwd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
+                bufsize=0,
+                # Own process group, so stop() can signal the command's children too.
+                start_new_session=True,
             )
             job.proc = proc
         except (OSError, ValueError) as exc:
@@ -108,36 +170,54 @@ class AsyncJobManager:
         with self._lock:
             self._jobs[job_id] = job
 
-        def reader(stream_name: str, pipe) -> None:
-            try:
-                if pipe is None:
-                    return
-                for line in pipe:
-                    self._append_event(job_id, stream_name, line.rstrip("\n"))
-            except OSError as exc:
-                self._set_error(job_id, f"{stream_name} reader error: {exc}")
-
-        threading.Thread(target=reader, args=("stdout", proc.stdout), daemon=True).start()
-        threading.Thread(target=reader, args=("stderr", proc.stderr), daemon=True).start()
-        threading.Thread(target=self._watch_process, args=(job_id,), daemon=True).start()
+        if _SELECTOR_IO:
+            self._io_submit(job_id, proc)
+            return job_id
+
+        readers = [
+            threading.Thread(target=self._read_pipe, args=(job_id, "stdout", proc.stdout), daemon=True),
+            threading.Thread(target=self._read_pipe, args=(job_id, "stderr", proc.stderr), daemon=True),
+        ]
+        for thread in readers:
+            thread.start()
+        threading.Thread(target=self._watch_process, args=(job_id, readers), daemon=True).start()
         return job_id
 
     def stop(self, job_id: str) -> bool:
         job = self.get_job(job_id)
         if job is None:
             return False
-        with self._lock:
-            if job.status != "running":
-                return True
-            job.status = "canceled"
-            job.last_update_at = time.time()
+        if not self._mark_canceled(job):
+            return True
+        if job.kind == "tail":
+            self._close_tail(job)
         if job.kind == "bash" and job.proc is not None:
+            proc = job.proc
             try:
-                job.proc.terminate()
+                _signal_process_group(proc, kill=False)
             except OSError:
                 pass
+            timer = threading.Timer(_STOP_GRACE_S, _kill_process_group_quietly, args=(proc,))
+            timer.daemon = True
+            timer.start()
         return True
 
+    def shutdown(self) -> None:
+        """Cancel every running job, killing bash jobs' process groups outright.
+
+        Bash jobs run in their own session, so the terminal's Ctrl-C never reaches them; this
+        runs at interpreter exit (and from the CLI) so they do not outlive the agent.
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not self._mark_canceled(job):
+                continue
+            if job.kind == "tail":
+                self._close_tail(job)
+            if job.kind == "bash" and job.proc is not None:
+                _kill_process_group_quietly(job.proc)
+
     def poll(self, job_id: str, *, since_seq: int = 0) -> Optional[dict]:
         job = self.get_job(job_id)
         if job is None:
@@ -146,55 +226,117 @@ class AsyncJobManager:
         if job.kind == "tail":
             self._poll_tail(job)
 
-        events = self._events_since(job, since_seq)
-        return {
-            "id": job.id,
-            "kind": job.kind,
-            "status": job.status,
-            "error": job.error,
-            "since_seq": since_seq,
-            "next_seq": job._next_seq,
-            "events": [{"seq": e.seq, "stream": e.stream, "text": e.text} for e in events],
-        }
+        with job._lock:
+            return {
+                "id": job.id,
+                "kind": job.kind,
+                "status": job.status,
+                "error": job.error,
+                "since_seq": since_seq,
+                "next_seq": job._next_seq,
+                "events": self._events_since(job, since_seq),
+            }
 
     def _job_summary(self, job: AsyncJob) -> dict:
-        detail: dict = {"id": job.id, "kind": job.kind, "status": job.status, "error": job.error}
+        with job._lock:
+            detail: dict = {"id": job.id, "kind": job.kind, "status": job.status, "error": job.error}
         if job.kind == "tail" and job.tail_path is not None:
             detail["path"] = str(job.tail_path)
         if job.kind == "bash" and job.proc is not None:
             detail["pid"] = getattr(job.proc, "pid", None)
         return detail
 
-    def _events_since(self, job: AsyncJob, since_seq: int) -> List[OutputEvent]:
-        with self._lock:
-            return [e for e in job._events if e.seq > since_seq]
+    def _events_since(self, job: AsyncJob, since_seq: int) -> List[dict]:
+        # Caller holds job._lock.
+        ring = job._ring
+        if not ring:
+            return []
+        capacity = len(ring)
+        start = max(since_seq + 1, job._ring_head_seq)
+        events: List[dict] = []
+        for seq in range(start, job._next_seq):
+            event = ring[(seq - 1) % capacity]
+            if event is not None and event.payload is not None:
+                events.append(event.payload)
+        return events
 
     def _append_event(self, job_id: str, stream: str, text: str) -> None:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job is None or job.status != "running":
+        self._append_events_bulk(job_id, stream, [text])
+
+    def _append_events_bulk(self, job_id: str, stream: str, texts: List[str]) -> None:
+        if not texts:
+            return
+        job = self.get_job(job_id)
+        if job is None:
+            return
+        with job._lock:
+            if job.status != "running":
                 return
-            seq = job._next_seq
-            job._next_seq += 1
-            event = OutputEvent(seq=seq, stream=stream, text=text)
-            job._events.append(event)
-            job._event_chars += len(text)
-            job.last_update_at = time.time()
-            while len(job._events) > self._max_events or job._event_chars > self._max_event_chars:
-                old = job._events.popleft()
-                job._event_chars -= len(old.text)
+            ring = job._ring
+            if not ring:
+                ring = job._ring = [None] * self._max_events
+            capacity = len(ring)
+            for text in texts:
+                seq = job._next_seq
+                if seq - job._ring_head_seq >= capacity:
+                    self._evict_oldest(job)
+                job._next_seq += 1
+                payload = {"seq": seq, "stream": stream, "text": text}
+                event = OutputEvent(seq=seq, stream=stream, text=text, text_len=len(text), payload=payload)
+                ring[(seq - 1) % capacity] = event
+                job._event_chars += event.text_len
+            job.last_update_at = time.monotonic_ns()
+            while job._event_chars > self._max_event_chars and job._ring_head_seq < job._next_seq:
+                self._evict_oldest(job)
+
+    def _evict_oldest(self, job: AsyncJob) -> None:
+        ring = job._ring
+        slot = (job._ring_head_seq - 1) % len(ring)
+        old = ring[slot]
+        ring[slot] = None
+        job._ring_head_seq += 1
+        if old is not None:
+            job._event_chars -= old.text_len
+
+    def _mark_canceled(self, job: AsyncJob) -> bool:
+        """Move a running job to canceled; False if it had already finished or been stopped."""
+        with job._lock:
+            if job.status != "running":
+                return False
+            job.status = "canceled"
+            job.last_update_at = time.monotonic_ns()
+        return True
 
     def _set_error(self, job_id: str, error: str) -> None:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return
+        job = self.get_job(job_id)
+        if job is None:
+            return
+        with job._lock:
             if job.status == "running":
                 job.status = "error"
             job.error = error
-            job.last_update_at = time.time()
+            job.last_update_at = time.monotonic_ns()
 
-    def _watch_process(self, job_id: str) -> None:
+    def _read_pipe(self, job_id: str, stream_name: str, pipe) -> None:
+        """Blocking per-pipe reader used where pipes cannot be multiplexed."""
+        try:
+            if pipe is None:
+                return
+            fd = pipe.fileno()
+            pending = b""
+            while True:
+                chunk = os.read(fd, _READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                complete, sep, pending = (pending + chunk).rpartition(b"\n")
+                if sep:
+                    self._append_events_bulk(job_id, stream_name, _decode_lines(complete))
+            if pending:
+                self._append_events_bulk(job_id, stream_name, _decode_lines(pending))
+        except (OSError, ValueError) as exc:
+            self._set_error(job_id, f"{stream_name} reader error: {exc}")
+
+    def _watch_process(self, job_id: str, readers: List[threading.Thread]) -> None:
         job = self.get_job(job_id)
         if job is None or job.proc is None:
             return
@@ -204,10 +346,17 @@ class AsyncJobManager:
         except (OSError, subprocess.SubprocessError) as exc:
             self._set_error(job_id, f"process wait error: {exc}")
             return
-        with self._lock:
-            current = self._jobs.get(job_id)
-            if current is None:
-                return
+        # Let the readers flush buffered output before the job leaves "running".
+        for thread in readers:
+            thread.join(timeout=_READER_DRAIN_TIMEOUT_S)
+        self._finish_process(job_id, code)
+
+    def _finish_process(self, job_id: str, code: int) -> None:
+        self._append_event(job_id, "meta", f"process exited with code {code}")
+        current = self.get_job(job_id)
+        if current is None:
+            return
+        with current._lock:
             if current.status == "canceled":
                 return
             if code == 0:
@@ -215,8 +364,135 @@ class AsyncJobManager:
             else:
                 current.status = "error"
                 current.error = f"exit {code}"
-            current.last_update_at = time.time()
-        self._append_event(job_id, "meta", f"process exited with code {code}")
+            current.last_update_at = time.monotonic_ns()
+
+    def _io_submit(self, job_id: str, proc: subprocess.Popen) -> None:
+        with self._io_lock:
+            self._io_pending.append((job_id, proc))
+            if self._io_thread is None:
+                read_fd, write_fd = os.pipe()
+                os.set_blocking(read_fd, False)
+                os.set_blocking(write_fd, False)
+                selector = selectors.DefaultSelector()
+                selector.register(read_fd, selectors.EVENT_READ, None)
+                self._io_selector = selector
+                self._io_wakeup_fd = write_fd
+                self._io_thread = threading.Thread(target=self._io_loop, daemon=True, name="lmao-async-io")
+                self._io_thread.start()
+            wakeup_fd = self._io_wakeup_fd
+        assert wakeup_fd is not None
+        try:
+            os.write(wakeup_fd, b"\0")
+        except BlockingIOError:
+            pass  # A wakeup is already queued.
+
+    def _io_loop(self) -> None:
+        selector = self._io_selector
+        assert selector is not None
+        active: Dict[str, _BashIO] = {}
+        while True:
+            timeout: Optional[float] = None
+            now = time.monotonic()
+            for state in active.values():
+                if state.exit_code is not None:
+                    wait = max(0.0, state.drain_deadline - now)
+                elif state.pidfd is None:
+                    wait = _EXIT_POLL_INTERVAL_S
+                else:
+                    continue
+                timeout = wait if timeout is None else min(timeout, wait)
+
+            for key, _mask in selector.select(timeout):
+                data: Union[None, _PipeIO, _BashIO] = key.data
+                try:
+                    if data is None:
+                        self._io_accept(selector, int(key.fd), active)
+                    elif isinstance(data, _PipeIO):
+                        self._io_read(selector, int(key.fd), data, active)
+                    else:
+                        self._io_reap(selector, data, active)
+                except Exception as exc:  # pragma: no cover - keep the shared I/O thread alive
+                    job_id = data.owner.job_id if isinstance(data, _PipeIO) else getattr(data, "job_id", "")
+                    if job_id:
+                        self._set_error(job_id, f"async io error: {exc}")
+
+            now = time.monotonic()
+            for state in list(active.values()):
+                if state.exit_code is None and state.pidfd is None:
+                    code = state.proc.poll()
+                    if code is not None:
+                        state.exit_code = code
+                        state.drain_deadline = now + _READER_DRAIN_TIMEOUT_S
+                if state.exit_code is not None and (state.open_streams == 0 or now >= state.drain_deadline):
+                    self._io_finish(state, active)
+
+    def _io_accept(self, selector: selectors.BaseSelector, wakeup_fd: int, active: Dict[str, _BashIO]) -> None:
+        try:
+            while os.read(wakeup_fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+        with self._io_lock:
+            pending = self._io_pending
+            self._io_pending = []
+        for job_id, proc in pending:
+            state = _BashIO(job_id=job_id, proc=proc)
+            for stream_name, pipe in (("stdout", proc.stdout), ("stderr", proc.stderr)):
+                if pipe is None:
+                    continue
+                selector.register(pipe.fileno(), selectors.EVENT_READ, _PipeIO(state, stream_name, pipe))
+                state.open_streams += 1
+            state.pidfd = _open_pidfd(proc.pid)
+            if state.pidfd is not None:
+                selector.register(state.pidfd, selectors.EVENT_READ, state)
+            active[job_id] = state
+
+    def _io_read(
+        self, selector: selectors.BaseSelector, fd: int, pipe_io: _PipeIO, active: Dict[str, _BashIO]
+    ) -> None:
+        job_id = pipe_io.owner.job_id
+        try:
+            chunk = os.read(fd, _READ_CHUNK_BYTES)
+        except OSError as exc:
+            self._set_error(job_id, f"{pipe_io.stream} reader error: {exc}")
+            chunk = b""
+        if chunk:
+            complete, sep, pipe_io.pending = (pipe_io.pending + chunk).rpartition(b"\n")
+            if sep:
+                self._append_events_bulk(job_id, pipe_io.stream, _decode_lines(complete))
+            return
+        selector.unregister(fd)
+        try:
+            pipe_io.pipe.close()
+        except OSError:
+            pass
+        if pipe_io.pending:
+            self._append_events_bulk(job_id, pipe_io.stream, _decode_lines(pipe_io.pending))
+            pipe_io.pending = b""
+        state = pipe_io.owner
+        state.open_streams -= 1
+        if state.exit_code is not None and state.open_streams == 0:
+            self._io_finish(state, active)
+
+    def _io_reap(self, selector: selectors.BaseSelector, state: _BashIO, active: Dict[str, _BashIO]) -> None:
+        code = state.proc.poll()
+        if code is None:
+            return
+        if state.pidfd is not None:
+            selector.unregister(state.pidfd)
+            os.close(state.pidfd)
+            state.pidfd = None
+        state.exit_code = code
+        state.drain_deadline = time.monotonic() + _READER_DRAIN_TIMEOUT_S
+        if state.open_streams == 0:
+            self._io_finish(state, active)
+
+    def _io_finish(self, state: _BashIO, active: Dict[str, _BashIO]) -> None:
+        if state.finished or state.exit_code is None:
+            return
+        state.finished = True
+        active.pop(state.job_id, None)
+        self._finish_process(state.job_id, state.exit_code)
 
     def _poll_tail(self, job: AsyncJob) -> None:
         if job.tail_path is None:
@@ -224,21 +500,119 @@ class AsyncJobManager:
         if job.status != "running":
             return
         path = job.tail_path
+        # Cheap change check: skip the read when the file has not grown or been touched.
         try:
-            with path.open("r", encoding=job.tail_encoding, errors="replace") as f:
-                f.seek(job.tail_offset)
-                data = f.read()
-                job.tail_offset = f.tell()
+            st = os.stat(path)
+        except OSError as exc:
+            self._close_tail(job)
+            self._set_error(job.id, f"tail read error: {exc}")
+            return
+        if job.tail_fp is not None and st.st_ino != job.tail_inode:
+            # Rotated/replaced: follow the new file from its beginning.
+            self._close_tail(job)
+            job.tail_offset = 0
+            job.tail_residual = ""
+        elif st.st_size < job.tail_offset:
+            # Truncated in place (copytruncate): restart from the beginning.
+            job.tail_offset = 0
+            job.tail_residual = ""
+            if job.tail_fp is not None:
+                job.tail_fp.seek(0)
+        if st.st_size == job.tail_offset and st.st_mtime_ns == job.tail_mtime_ns:
+            return
+        job.tail_mtime_ns = st.st_mtime_ns
+        try:
+            fp = job.tail_fp
+            if fp is None:
+                fp = path.open("r", encoding=job.tail_encoding, errors="replace")
+                job.tail_fp = fp
+                job.tail_inode = os.fstat(fp.fileno()).st_ino
+                fp.seek(job.tail_offset)
+            data = fp.read()
+            job.tail_offset = fp.tell()
         except (OSError, LookupError, UnicodeError, ValueError) as exc:
+            self._close_tail(job)
             self._set_error(job.id, f"tail read error: {exc}")
             return
         if not data:
             return
-        for line in data.splitlines():
-            self._append_event(job.id, "tail", line)
+        combined = job.tail_residual + data
+        idx = combined.rfind("\n")
+        if idx < 0:
+            job.tail_residual = combined
+            return
+        job.tail_residual = combined[idx + 1 :]
+        self._append_events_bulk(job.id, "tail", combined[:idx].split("\n"))
+
+    def _close_tail(self, job: AsyncJob) -> None:
+        fp = job.tail_fp
+        job.tail_fp = None
+        if fp is None:
+            return
+        try:
+            fp.close()
+        except OSError:
+            pass
+
+
+def _decode_lines(data: bytes) -> List[str]:
+    """Decode newline-separated output in one pass, dropping CRLF carriage returns."""
+    return [line[:-1] if line.endswith("\r") else line for line in data.decode("utf-8", "replace").split("\n")]
+
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """Return argv for commands that need no shell (plain `prog arg ...`), else None."""
+    if os.name == "nt" or _SHELL_METACHARS_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or "=" in argv[0] or "/" in argv[0] or os.sep in argv[0]:
+        # Env assignments and relative paths (resolved against the job cwd) stay with the shell.
+        return None
+    if shutil.which(argv[0]) is None:
+        # Builtins such as cd/export/exit, or unknown commands (keep the shell's error reporting).
+        return None
+    return argv
+
+
+def _signal_process_group(proc: subprocess.Popen, *, kill: bool) -> None:
+    """Signal a bash job's whole process group (POSIX) or just its process (Windows)."""
+    if os.name == "nt":
+        if proc.poll() is None:
+            if kill:
+                proc.kill()
+            else:
+                proc.terminate()
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL if kill else signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+
+def _kill_process_group_quietly(proc: subprocess.Popen) -> None:
+    try:
+        _signal_process_group(proc, kill=True)
+    except OSError:
+        pass
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """Return a pollable process fd (Linux 5.3+), or None to fall back to exit polling."""
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        return int(pidfd_open(pid))
+    except OSError:
+        return None
 
 
 _DEFAULT_MANAGER: Optional[AsyncJobManager] = None
+# Every live manager, so exit can reap jobs started outside the default one too.
+_MANAGERS: weakref.WeakSet[AsyncJobManager] = weakref.WeakSet()
 
 
 def get_async_job_manager() -> AsyncJobManager:
@@ -246,3 +620,12 @@ def get_async_job_manager() -> AsyncJobManager:
     if _DEFAULT_MANAGER is None:
         _DEFAULT_MANAGER = AsyncJobManager()
     return _DEFAULT_MANAGER
+
+
+def shutdown_all_jobs() -> None:
+    """Cancel the running jobs of every manager; safe to call more than once."""
+    for manager in list(_MANAGERS):
+        manager.shutdown()
+
+
+atexit.register(shutdown_all_jobs)
@@ -1,43 +1,45 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import sys
 import warnings
 from pathlib import Path
-from typing import Optional, cast
+from typing import TYPE_CHECKING, Optional, cast
 
 from .config import (
     ConfigLoadResult,
     ProviderSettings,
     UserConfig,
     load_user_config,
-    pick_first_non_none,
     resolve_default_config_path,
     resolve_openrouter_api_key,
     resolve_openrouter_headers,
     resolve_provider_settings,
     write_default_config,
 )
-from .debug_log import DebugLogger
-from .error_log import ErrorLogger
-from .llm import LLMClient, ProviderName
-from .loop import run_loop
-from .openrouter_free_models import (
-    OpenRouterFreeModelPreferences,
-    OpenRouterModelDiscovery,
-    OpenRouterFreeModelSelector,
-    OpenRouterModelSelectionError,
-    derive_models_endpoint,
-    resolve_model_cache_path,
-)
 
-LMSTUDIO_DEFAULT_ENDPOINT = os.environ.get(
-    "LM_STUDIO_URL", "http://localhost:1234/v1/chat/completions"
-)
-LMSTUDIO_DEFAULT_MODEL = os.environ.get("LM_STUDIO_MODEL", "qwen")
+if TYPE_CHECKING:
+    from .llm import ProviderName
+
+# The agent runtime (LLM client, loop, plugins, loggers) is imported inside main() on the paths
+# that need it, so --help, --config-init and argument errors skip that import graph.
+
+# LM_STUDIO_URL / LM_STUDIO_MODEL are read per call by resolve_provider_settings, ahead of these.
+LMSTUDIO_DEFAULT_ENDPOINT = "http://localhost:1234/v1/chat/completions"
+LMSTUDIO_DEFAULT_MODEL = "qwen"
 OPENROUTER_DEFAULT_ENDPOINT = "https://openrouter.ai/api/v1/chat/completions"
+# Package location is fixed for the life of the process; resolved once at import.
+_BUILTIN_PLUGINS_DIR = Path(__file__).resolve().parent / "tools"
+
+_ENDPOINT_HELP = (
+    "Chat completions endpoint URL; default depends on --provider "
+    f"(lmstudio: LM_STUDIO_URL or {LMSTUDIO_DEFAULT_ENDPOINT}, openrouter: {OPENROUTER_DEFAULT_ENDPOINT})"
+)
+_MODEL_HELP = (
+    "Model name; default depends on --provider "
+    f"(lmstudio: LM_STUDIO_MODEL or {LMSTUDIO_DEFAULT_MODEL}, openrouter: config/env override required)"
+)
 
 
 def _resolve_debug_log_path(base_dir: Path, config_log_path: Optional[str]) -> Path:
@@ -98,15 +100,12 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--endpoint",
         default=None,
-        help=(
-            "Chat completions endpoint URL; default depends on --provider "
-            f"(lmstudio: LM_STUDIO_URL or {LMSTUDIO_DEFAULT_ENDPOINT}, openrouter: {OPENROUTER_DEFAULT_ENDPOINT})"
-        ),
+        help=_ENDPOINT_HELP,
     )
     parser.add_argument(
         "--model",
         default=None,
-        help="Model name; default depends on --provider (lmstudio: LM_STUDIO_MODEL or qwen, openrouter: config/env override required)",
+        help=_MODEL_HELP,
     )
     parser.add_argument(
         "--free",
@@ -253,6 +252,8 @@ def _config_summary(
         "policy_truncate": policy_truncate,
         "policy_truncate_chars": policy_truncate_chars,
     }
+    import json  # Only needed for --print-config.
+
     return json.dumps(summary, ensure_ascii=False, indent=2)
 
 
@@ -260,9 +261,10 @@ def main() -> None:
     parser = build_arg_parser()
     args = parser.parse_args()
 
-    default_config_path = resolve_default_config_path()
     config_path = (
-        Path(args.config).expanduser().resolve(strict=False) if args.config else default_config_path
+        Path(args.config).expanduser().resolve(strict=False)
+        if args.config
+        else resolve_default_config_path()
     )
     if args.config_init:
         try:
@@ -284,7 +286,7 @@ def main() -> None:
 
     provider_value = args.provider or config.provider
     provider = provider_value.lower() if provider_value else "lmstudio"
-    provider_name = cast(ProviderName, provider)
+    provider_name = cast("ProviderName", provider)
 
     if args.free and provider_name != "openrouter":
         parser.error("--free is only valid with the openrouter provider")
@@ -308,14 +310,23 @@ def main() -> None:
     except ValueError as exc:
         parser.error(str(exc))
 
-    temperature = pick_first_non_none((args.temperature, config.temperature), 0.2)
-    assert temperature is not None
-    top_p = pick_first_non_none((args.top_p, config.top_p), None)
-    max_tokens = pick_first_non_none((args.max_tokens, config.max_tokens), None)
-    max_tool_lines = pick_first_non_none((args.max_tool_lines, config.max_tool_lines), 8)
-    assert max_tool_lines is not None
-    max_tool_chars = pick_first_non_none((args.max_tool_chars, config.max_tool_chars), 400)
-    assert max_tool_chars is not None
+    temperature: float = (
+        args.temperature
+        if args.temperature is not None
+        else config.temperature if config.temperature is not None else 0.2
+    )
+    top_p = args.top_p if args.top_p is not None else config.top_p
+    max_tokens = args.max_tokens if args.max_tokens is not None else config.max_tokens
+    max_tool_lines: int = (
+        args.max_tool_lines
+        if args.max_tool_lines is not None
+        else config.max_tool_lines if config.max_tool_lines is not None else 8
+    )
+    max_tool_chars: int = (
+        args.max_tool_chars
+        if args.max_tool_chars is not None
+        else config.max_tool_chars if config.max_tool_chars is not None else 400
+    )
     max_turns = args.max_turns if args.max_turns is not None else config.max_turns
 
     silent_tools = args.silent_tools or bool(config.silent_tools)
@@ -359,6 +370,9 @@ def main() -> None:
         else Path.cwd().resolve(strict=False)
     )
 
+    from .debug_log import DebugLogger
+    from .error_log import ErrorLogger
+
     debug_logger = (
         DebugLogger(_resolve_debug_log_path(base_dir, config.debug_log_path))
         if args.debug
@@ -394,6 +408,15 @@ def main() -> None:
     if free_selection_requested:
         if not api_key:
             parser.error("OpenRouter API key is required for automatic free model selection.")
+        from .openrouter_free_models import (
+            OpenRouterFreeModelPreferences,
+            OpenRouterFreeModelSelector,
+            OpenRouterModelDiscovery,
+            OpenRouterModelSelectionError,
+            derive_models_endpoint,
+            resolve_model_cache_path,
+        )
+
         preferences = OpenRouterFreeModelPreferences(
             default_model=config.openrouter_free_default_model,
             blacklist=config.openrouter_free_blacklist,
@@ -469,6 +492,9 @@ def main() -> None:
             "Headless mode requires a predefined prompt (positional prompt, --prompt-file, or default_prompt in config)."
         )
 
+    from .llm import LLMClient
+    from .loop import run_loop
+
     client = LLMClient(
         endpoint=provider_settings.endpoint,
         model=provider_settings.model,
@@ -492,7 +518,6 @@ def main() -> None:
     )
 
     try:
-        built_in_plugins_dir = Path(__file__).resolve().parent / "tools"
         run_loop(
             initial_prompt=initial_prompt,
             client=client,
@@ -505,7 +530,7 @@ def main() -> None:
             show_stats=not no_stats and not quiet,
             headless=headless_mode,
             multiline=multiline,
-            plugin_dirs=[built_in_plugins_dir],
+            plugin_dirs=[_BUILTIN_PLUGINS_DIR],
             debug_logger=debug_logger,
             error_logger=error_logger,
             policy_truncate=policy_truncate,
@@ -518,6 +543,11 @@ def main() -> None:
     except Exception as exc:
         print(f"error: {exc}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        # Async bash jobs run in their own session, out of reach of the terminal's Ctrl-C.
+        from .async_jobs import shutdown_all_jobs
+
+        shutdown_all_jobs()
 
 
 if __name__ == "__main__":
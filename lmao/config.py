@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import configparser
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Mapping, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional
 
-from .llm import ProviderName
+if TYPE_CHECKING:
+    from configparser import ConfigParser
 
-T = TypeVar("T")
+    from .llm import ProviderName
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserConfig:
     provider: Optional[ProviderName] = None
     mode: Optional[str] = None
@@ -47,13 +48,13 @@ class UserConfig:
     policy_truncate_chars: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProviderSettings:
     endpoint: str
     model: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConfigLoadResult:
     path: Path
     config: UserConfig
@@ -61,78 +62,28 @@ class ConfigLoadResult:
     loaded: bool
 
 
-DEFAULT_CONFIG_TEMPLATE = """[core]
-provider = lmstudio
-mode = normal
-default_prompt =
-headless = false
-multiline = false
-silent_tools = false
-no_stats = false
-quiet = false
-no_tools = false
-max_turns =
-workdir =
-
-[policy]
-; Startup `policy` tool call behavior (AGENTS.md excerpt in the initial prompt).
-; When truncate=false, the full AGENTS.md is included (may bloat the prompt).
-truncate = true
-truncate_chars = 2000
-
-[lmstudio]
-endpoint = http://localhost:1234/v1/chat/completions
-model = qwen3-4b-instruct
-context_window_tokens =
-
-[openrouter]
-endpoint = https://openrouter.ai/api/v1/chat/completions
-model =
-context_window_tokens =
-http_referer =
-app_title =
-; API key can be set directly or via env var (api_key takes precedence)
-api_key =
-api_key_env = OPENROUTER_API_KEY
-free_default_model =
-free_blacklist =
-
-[generation]
-temperature = 0.2
-top_p =
-max_tokens =
-
-[tool_output]
-max_tool_lines = 8
-max_tool_chars = 400
-
-[debug]
-log_path =
-
-[errors]
-log_path =
-"""
+def resolve_default_config_path() -> Path:
+    # The environment values are the cache key, so tests or embedders that change them still
+    # get a fresh path; repeated calls within one run (help text, main, model cache) do not.
+    if os.name == "nt":
+        return _default_config_path(
+            os.environ.get("XDG_CONFIG_HOME"), os.environ.get("APPDATA"), os.environ.get("USERPROFILE")
+        )
+    return _default_config_path(os.environ.get("XDG_CONFIG_HOME"), None, os.environ.get("HOME"))
 
 
-def resolve_default_config_path() -> Path:
-    config_home = os.environ.get("XDG_CONFIG_HOME")
+@lru_cache(maxsize=8)
+def _default_config_path(config_home: Optional[str], appdata: Optional[str], home: Optional[str]) -> Path:
+    # `home` only keys the cache; Path.home() reads the same variable.
     if config_home:
         base = Path(config_home)
-    elif os.name == "nt":
-        appdata = os.environ.get("APPDATA")
-        base = Path(appdata) if appdata else Path.home() / ".config"
+    elif appdata:
+        base = Path(appdata)
     else:
         base = Path.home() / ".config"
     return (base / "agents" / "lmao.conf").expanduser()
 
 
-def pick_first_non_none(values: Iterable[Optional[T]], default: Optional[T]) -> Optional[T]:
-    for value in values:
-        if value is not None:
-            return value
-    return default
-
-
 def resolve_provider_settings(
     provider: ProviderName,
     *,
@@ -150,47 +101,45 @@ def resolve_provider_settings(
     env_openrouter_model = environment.get("OPENROUTER_MODEL")
 
     if provider == "lmstudio":
-        endpoint = pick_first_non_none(
-            (
-                cli_endpoint,
-                env_lmstudio_endpoint,
-                config.lmstudio_endpoint,
-            ),
-            lmstudio_default_endpoint,
+        endpoint = (
+            cli_endpoint
+            if cli_endpoint is not None
+            else env_lmstudio_endpoint
+            if env_lmstudio_endpoint is not None
+            else config.lmstudio_endpoint
+            if config.lmstudio_endpoint is not None
+            else lmstudio_default_endpoint
         )
-        assert endpoint is not None
-        model = pick_first_non_none(
-            (
-                cli_model,
-                env_lmstudio_model,
-                config.lmstudio_model,
-            ),
-            lmstudio_default_model,
+        model = (
+            cli_model
+            if cli_model is not None
+            else env_lmstudio_model
+            if env_lmstudio_model is not None
+            else config.lmstudio_model
+            if config.lmstudio_model is not None
+            else lmstudio_default_model
         )
-        assert model is not None
         return ProviderSettings(endpoint=endpoint, model=model)
 
-    endpoint = pick_first_non_none(
-        (
-            cli_endpoint,
-            config.openrouter_endpoint,
-        ),
-        openrouter_default_endpoint,
+    endpoint = (
+        cli_endpoint
+        if cli_endpoint is not None
+        else config.openrouter_endpoint
+        if config.openrouter_endpoint is not None
+        else openrouter_default_endpoint
     )
-    assert endpoint is not None
-    model = pick_first_non_none(
-        (
-            cli_model,
-            env_openrouter_model,
-            config.openrouter_model,
-        ),
-        None,
+    openrouter_model = (
+        cli_model
+        if cli_model is not None
+        else env_openrouter_model
+        if env_openrouter_model is not None
+        else config.openrouter_model
     )
-    if model is None:
+    if openrouter_model is None:
         raise ValueError(
             "Missing --model for provider openrouter (e.g. openai/gpt-4o-mini)."
         )
-    return ProviderSettings(endpoint=endpoint, model=model)
+    return ProviderSettings(endpoint=endpoint, model=openrouter_model)
 
 
 def resolve_openrouter_headers(
@@ -201,21 +150,21 @@ def resolve_openrouter_headers(
     env: Optional[Mapping[str, str]] = None,
 ) -> tuple[Optional[str], Optional[str]]:
     environment = env or os.environ
-    referer = pick_first_non_none(
-        (
-            cli_referer,
-            environment.get("OPENROUTER_HTTP_REFERER"),
-            config.openrouter_http_referer,
-        ),
-        None,
+    env_referer = environment.get("OPENROUTER_HTTP_REFERER")
+    env_title = environment.get("OPENROUTER_APP_TITLE")
+    referer = (
+        cli_referer
+        if cli_referer is not None
+        else env_referer
+        if env_referer is not None
+        else config.openrouter_http_referer
     )
-    title = pick_first_non_none(
-        (
-            cli_title,
-            environment.get("OPENROUTER_APP_TITLE"),
-            config.openrouter_app_title,
-        ),
-        None,
+    title = (
+        cli_title
+        if cli_title is not None
+        else env_title
+        if env_title is not None
+        else config.openrouter_app_title
     )
     return referer, title
 
@@ -237,6 +186,9 @@ def resolve_openrouter_api_key(
 
 
 def load_user_config(path: Path) -> ConfigLoadResult:
+    # Imported on use, so CLI paths that exit before loading the config skip it.
+    import configparser
+
     parser = configparser.ConfigParser()
     try:
         with path.open("r", encoding="utf-8") as handle:
@@ -255,44 +207,7 @@ def load_user_config(path: Path) -> ConfigLoadResult:
 
     try:
         config = UserConfig(
-            provider=_read_provider_name(parser, "core", "provider"),
-            mode=_read_string(parser, "core", "mode"),
-            default_prompt=_read_string(parser, "core", "default_prompt"),
-            headless=_read_bool(parser, "core", "headless"),
-            multiline=_read_bool(parser, "core", "multiline"),
-            silent_tools=_read_bool(parser, "core", "silent_tools"),
-            no_stats=_read_bool(parser, "core", "no_stats"),
-            quiet=_read_bool(parser, "core", "quiet"),
-            no_tools=_read_bool(parser, "core", "no_tools"),
-            max_turns=_read_int(parser, "core", "max_turns"),
-            workdir=_read_string(parser, "core", "workdir"),
-            temperature=_read_float(parser, "generation", "temperature"),
-            top_p=_read_float(parser, "generation", "top_p"),
-            max_tokens=_read_int(parser, "generation", "max_tokens"),
-            max_tool_lines=_read_int(parser, "tool_output", "max_tool_lines"),
-            max_tool_chars=_read_int(parser, "tool_output", "max_tool_chars"),
-            lmstudio_endpoint=_read_string(parser, "lmstudio", "endpoint"),
-            lmstudio_model=_read_string(parser, "lmstudio", "model"),
-            lmstudio_context_window_tokens=_read_int(parser, "lmstudio", "context_window_tokens"),
-            openrouter_endpoint=_read_string(parser, "openrouter", "endpoint"),
-            openrouter_model=_read_string(parser, "openrouter", "model"),
-            openrouter_context_window_tokens=_read_int(
-                parser, "openrouter", "context_window_tokens"
-            ),
-            openrouter_http_referer=_read_string(parser, "openrouter", "http_referer"),
-            openrouter_app_title=_read_string(parser, "openrouter", "app_title"),
-            openrouter_api_key=_read_string(parser, "openrouter", "api_key"),
-            openrouter_api_key_env=_read_string(parser, "openrouter", "api_key_env"),
-            openrouter_free_default_model=_read_string(
-                parser, "openrouter", "free_default_model"
-            ),
-            openrouter_free_blacklist=_read_list(
-                parser, "openrouter", "free_blacklist"
-            ),
-            debug_log_path=_read_string(parser, "debug", "log_path"),
-            error_log_path=_read_string(parser, "errors", "log_path"),
-            policy_truncate=_read_bool(parser, "policy", "truncate"),
-            policy_truncate_chars=_read_int(parser, "policy", "truncate_chars"),
+            **{name: reader(parser, section, option) for name, section, option, reader in _FIELDS}
         )
     except ValueError as exc:
         return ConfigLoadResult(
@@ -308,13 +223,18 @@ def write_default_config(path: Path) -> bool:
     if path.exists():
         return False
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(DEFAULT_CONFIG_TEMPLATE, encoding="utf-8")
+    path.write_text(_default_config_template(), encoding="utf-8")
     return True
 
 
-def _read_string(
-    parser: configparser.ConfigParser, section: str, option: str
-) -> Optional[str]:
+def _default_config_template() -> str:
+    """Return the commented lmao.conf written by --config-init (only needed on that path)."""
+    from importlib.resources import files
+
+    return files("lmao").joinpath("data/lmao.conf.template").read_text(encoding="utf-8")
+
+
+def _read_string(parser: ConfigParser, section: str, option: str) -> Optional[str]:
     if not parser.has_section(section) or not parser.has_option(section, option):
         return None
     raw = parser.get(section, option)
@@ -324,9 +244,7 @@ def _read_string(
     return value if value else None
 
 
-def _read_provider_name(
-    parser: configparser.ConfigParser, section: str, option: str
-) -> Optional[ProviderName]:
+def _read_provider_name(parser: ConfigParser, section: str, option: str) -> Optional[ProviderName]:
     value = _read_string(parser, section, option)
     if value is None:
         return None
@@ -338,9 +256,7 @@ def _read_provider_name(
     raise ValueError(f"Invalid provider value for [{section}] {option}: {value}")
 
 
-def _read_list(
-    parser: configparser.ConfigParser, section: str, option: str
-) -> tuple[str, ...]:
+def _read_list(parser: ConfigParser, section: str, option: str) -> tuple[str, ...]:
     raw = _read_string(parser, section, option)
     if raw is None:
         return ()
@@ -352,9 +268,7 @@ def _read_list(
     return tuple(entries)
 
 
-def _read_bool(
-    parser: configparser.ConfigParser, section: str, option: str
-) -> Optional[bool]:
+def _read_bool(parser: ConfigParser, section: str, option: str) -> Optional[bool]:
     value = _read_string(parser, section, option)
     if value is None:
         return None
@@ -366,9 +280,7 @@ def _read_bool(
     raise ValueError(f"Invalid boolean for [{section}] {option}: {value}")
 
 
-def _read_int(
-    parser: configparser.ConfigParser, section: str, option: str
-) -> Optional[int]:
+def _read_int(parser: ConfigParser, section: str, option: str) -> Optional[int]:
     value = _read_string(parser, section, option)
     if value is None:
         return None
@@ -378,9 +290,7 @@ def _read_int(
         raise ValueError(f"Invalid integer for [{section}] {option}: {value}") from exc
 
 
-def _read_float(
-    parser: configparser.ConfigParser, section: str, option: str
-) -> Optional[float]:
+def _read_float(parser: ConfigParser, section: str, option: str) -> Optional[float]:
     value = _read_string(parser, section, option)
     if value is None:
         return None
@@ -388,3 +298,40 @@ def _read_float(
         return float(value)
     except ValueError as exc:
         raise ValueError(f"Invalid float for [{section}] {option}: {value}") from exc
+
+
+# UserConfig field -> ([section] option, reader); load_user_config fills every field from this.
+_FIELDS: tuple[tuple[str, str, str, Callable[[ConfigParser, str, str], Any]], ...] = (
+    ("provider", "core", "provider", _read_provider_name),
+    ("mode", "core", "mode", _read_string),
+    ("default_prompt", "core", "default_prompt", _read_string),
+    ("headless", "core", "headless", _read_bool),
+    ("multiline", "core", "multiline", _read_bool),
+    ("silent_tools", "core", "silent_tools", _read_bool),
+    ("no_stats", "core", "no_stats", _read_bool),
+    ("quiet", "core", "quiet", _read_bool),
+    ("no_tools", "core", "no_tools", _read_bool),
+    ("max_turns", "core", "max_turns", _read_int),
+    ("workdir", "core", "workdir", _read_string),
+    ("temperature", "generation", "temperature", _read_float),
+    ("top_p", "generation", "top_p", _read_float),
+    ("max_tokens", "generation", "max_tokens", _read_int),
+    ("max_tool_lines", "tool_output", "max_tool_lines", _read_int),
+    ("max_tool_chars", "tool_output", "max_tool_chars", _read_int),
+    ("lmstudio_endpoint", "lmstudio", "endpoint", _read_string),
+    ("lmstudio_model", "lmstudio", "model", _read_string),
+    ("lmstudio_context_window_tokens", "lmstudio", "context_window_tokens", _read_int),
+    ("openrouter_endpoint", "openrouter", "endpoint", _read_string),
+    ("openrouter_model", "openrouter", "model", _read_string),
+    ("openrouter_context_window_tokens", "openrouter", "context_window_tokens", _read_int),
+    ("openrouter_http_referer", "openrouter", "http_referer", _read_string),
+    ("openrouter_app_title", "openrouter", "app_title", _read_string),
+    ("openrouter_api_key", "openrouter", "api_key", _read_string),
+    ("openrouter_api_key_env", "openrouter", "api_key_env", _read_string),
+    ("openrouter_free_default_model", "openrouter", "free_default_model", _read_string),
+    ("openrouter_free_blacklist", "openrouter", "free_blacklist", _read_list),
+    ("debug_log_path", "debug", "log_path", _read_string),
+    ("error_log_path", "errors", "log_path", _read_string),
+    ("policy_truncate", "policy", "truncate", _read_bool),
+    ("policy_truncate_chars", "policy", "truncate_chars", _read_int),
+)
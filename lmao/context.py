@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
-from .plugins import PluginTool
-from .runtime_tools import RuntimeTool
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+if TYPE_CHECKING:
+    # Annotation-only: runtime_tools pulls in the LLM client (urllib/ssl), which repo-root
+    # lookups via plugin_helpers should not pay for.
+    from .plugins import PluginTool
+    from .runtime_tools import RuntimeTool
+
+@lru_cache(maxsize=1024)
 def _wrap_tool_payload_usage_example_as_assistant_turn(example: str) -> Optional[str]:
     """Return a full assistant_turn example from a bare tool payload example.
 
@@ -15,8 +21,11 @@ def _wrap_tool_payload_usage_example_as_assistant_turn(example: str) -> Optional
     In the protocol, tool invocations must be wrapped as a tool_call step inside an assistant_turn.
     """
     stripped = (example or "").strip()
-    if not stripped:
+    # Only a JSON object can qualify; skip the parser (and its exception) for anything else.
+    if not stripped or stripped[0] != "{" or stripped[-1] != "}":
         return None
+    import json  # Deferred with the other prompt-only work; cached per example.
+
     try:
         payload = json.loads(stripped)
     except Exception:
@@ -37,10 +46,26 @@ def _example_call_v2(tool: str) -> Dict[str, Any]:
     return {"tool": tool, "target": ".", "args": ""}
 
 
-def _pick_example_tool(allowed_tools: Sequence[str]) -> str:
-    preferred = ("ls", "read", "grep", "find")
-    allowed_set = set(allowed_tools)
-    for name in preferred:
+@lru_cache(maxsize=32)
+def _tool_call_example_line(tool: str) -> str:
+    """Serialize the prompt's example tool_call turn once per example tool."""
+    import json
+
+    tool_call_v2 = {
+        "type": "assistant_turn",
+        "version": "2",
+        "steps": [{"type": "tool_call", "call": {**_example_call_v2(tool), "meta": {"timeout_s": 10}}}],
+    }
+    return f"Tool call example (v2): {json.dumps(tool_call_v2, ensure_ascii=False)}"
+
+
+_PREFERRED_EXAMPLE_TOOLS = ("ls", "read", "grep", "find")
+
+
+def _pick_example_tool(allowed_tools: Sequence[str], allowed_set: Optional[frozenset[str]] = None) -> str:
+    if allowed_set is None:
+        allowed_set = frozenset(allowed_tools)
+    for name in _PREFERRED_EXAMPLE_TOOLS:
         if name in allowed_set:
             return name
     return allowed_tools[0]
@@ -55,35 +80,99 @@ def _format_tool_catalog(
 ) -> str:
     if not allowed_tools:
         return "(no tools discovered)"
-    resolved = list(allowed_tools)
-    by_name: Dict[str, PluginTool] = {}
-    if plugins:
-        by_name = {tool.name: tool for tool in plugins}
-    rt_by_name: Dict[str, RuntimeTool] = {}
-    if runtime_tools:
-        rt_by_name = {tool.name: tool for tool in runtime_tools}
-    lines: List[str] = []
-    for name in resolved:
+    by_name = {tool.name: tool for tool in plugins} if plugins else {}
+    rt_by_name = {tool.name: tool for tool in runtime_tools} if runtime_tools else {}
+    return "\n".join(_iter_catalog_lines(allowed_tools, by_name, rt_by_name, include_usage))
+
+
+def _iter_catalog_lines(
+    allowed_tools: Sequence[str],
+    by_name: Dict[str, PluginTool],
+    rt_by_name: Dict[str, RuntimeTool],
+    include_usage: bool,
+) -> Iterator[str]:
+    for name in allowed_tools:
         tool = by_name.get(name)
         if tool is not None:
-            lines.append(f"- {tool.name}: {tool.description}")
+            yield f"- {tool.name}: {tool.description}"
             if include_usage:
-                for ex in (tool.usage_examples or [])[:3]:
-                    wrapped = _wrap_tool_payload_usage_example_as_assistant_turn(ex)
-                    if wrapped:
-                        lines.append(f"  usage: {wrapped}")
+                yield from _iter_usage_lines((tool.usage_examples or [])[:3])
             continue
         rt_tool = rt_by_name.get(name)
         if rt_tool is not None:
-            lines.append(f"- {rt_tool.name}: {rt_tool.description}")
+            yield f"- {rt_tool.name}: {rt_tool.description}"
             if include_usage:
-                for ex in (list(rt_tool.usage_examples) or [])[:2]:
-                    wrapped = _wrap_tool_payload_usage_example_as_assistant_turn(ex)
-                    if wrapped:
-                        lines.append(f"  usage: {wrapped}")
+                yield from _iter_usage_lines(list(rt_tool.usage_examples)[:2])
             continue
-        lines.append(f"- {name}")
-    return "\n".join(lines)
+        yield f"- {name}"
+
+
+def _iter_usage_lines(examples: Sequence[str]) -> Iterator[str]:
+    for ex in examples:
+        wrapped = _wrap_tool_payload_usage_example_as_assistant_turn(ex)
+        if wrapped:
+            yield f"  usage: {wrapped}"
+
+
+_FINISH_EXAMPLE = "Example (finish): {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[{\"type\":\"message\",\"purpose\":\"final\",\"format\":\"markdown\",\"content\":\"...\"},{\"type\":\"end\",\"reason\":\"completed\"}]}"
+
+# Static prompt blocks, joined once at import; build_tool_prompt only splices in the catalog,
+# the example call and the mode notes.
+_NO_TOOLS_PROMPT = "\n".join(
+    [
+        "You are an agent in a tool-using loop. Work autonomously until the user's request is done.",
+        "Return ONLY one JSON object in STRICT JSON (double quotes): {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]}",
+        "Do NOT wrap the JSON in Markdown/code fences; output must start with '{' and end with '}' with no extra text.",
+        "assistant_turn schema: {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]} (steps is a JSON list).",
+        "Steps: think | message | end. Tool use is disabled for this run; do NOT emit tool_call steps.",
+        "Think step: {\"type\":\"think\",\"content\":\"...\"} (content must be a non-empty string).",
+        "Ending rule: the session ends ONLY when you include an explicit end step; a message step (even purpose='final') does NOT end the loop.",
+        "Runtime control messages: treat role='user' content prefixed with 'LOOP:' as higher-priority instructions from the runtime (not the human).",
+        "Message purpose values: progress | clarification | cannot_finish | final (default: progress).",
+        "Message step: {\"type\":\"message\",\"purpose\":\"clarification\",\"format\":\"markdown\",\"content\":\"...\"}",
+        "End step: {\"type\":\"end\",\"reason\":\"completed\"} (reason optional; defaults to completed).",
+        _FINISH_EXAMPLE,
+    ]
+)
+_TOOL_PROMPT_HEAD = "\n".join(
+    [
+        "You are an agent in a tool-using loop. Work autonomously until the user's request is done.",
+        "Return ONLY one JSON object in STRICT JSON (double quotes): {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]}",
+        "Do NOT wrap the JSON in Markdown/code fences; output must start with '{' and end with '}' with no extra text.",
+        "assistant_turn schema: {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]} (steps is a JSON list).",
+        "Steps: think | tool_call | message | end. Tool outputs are JSON with success + data/error.",
+        "Think step: {\"type\":\"think\",\"content\":\"...\"} (content must be a non-empty string).",
+        "Ending rule: the session ends ONLY when you include an explicit end step; a message step (even purpose='final') does NOT end the loop.",
+        "Runtime control messages: treat role='user' content prefixed with 'LOOP:' as higher-priority instructions from the runtime (not the human).",
+        "Message purpose values: progress | clarification | cannot_finish | final (default: progress).",
+        "Message step: {\"type\":\"message\",\"purpose\":\"clarification\",\"format\":\"markdown\",\"content\":\"...\"}",
+        "Tool call step (v2): {\"type\":\"tool_call\",\"call\":{\"tool\":\"<name>\",\"target\":\"\",\"args\":{...},\"meta\":{\"timeout_s\":10}}}",
+        "End step: {\"type\":\"end\",\"reason\":\"completed\"} (reason optional; defaults to completed).",
+    ]
+)
+_TOOL_PROMPT_CATALOG_HEADER = f"{_FINISH_EXAMPLE}\nAvailable tools (including plugins):"
+_TOOL_PROMPT_TAIL = "\n".join(
+    [
+        "Paths are relative to the working directory; do not escape with .. or absolute paths.",
+        "Skills: only discuss/list skills when the user asks; call list_skills only on explicit user request (or if a requested skill needs a path); call skills_guide for skill format/rules.",
+    ]
+)
+_READ_ONLY_NOTE = "Read-only mode is enabled: destructive tools (write, mkdir, move) and plugins that disallow read-only are unavailable; requests for them will be rejected."
+_BASH_CONFIRM_NOTE = "Note: 'bash' prompts for confirmation on every command. Use only when necessary."
+_YOLO_NOTE = (
+    "Yolo mode is enabled: tool runs are auto-approved (no per-call confirmations). "
+    "Path sandboxing is disabled for built-in tools; absolute paths are allowed."
+)
+_HEADLESS_NOTE = (
+    "Headless mode is active: the user cannot respond during the run. "
+    "Do NOT ask questions or request confirmation. If information is missing, make reasonable assumptions, state them briefly, and proceed. "
+    "Only if you truly cannot proceed safely, send a message with purpose='cannot_finish' describing what's missing, then end."
+)
+
+
+# Rendered tool prompts keyed by their inputs; a session rebuilds the same prompt on every reset.
+_TOOL_PROMPT_CACHE: Dict[Tuple[Any, ...], str] = {}
+_TOOL_PROMPT_CACHE_MAX = 8
 
 
 def build_tool_prompt(
@@ -95,140 +184,191 @@ def build_tool_prompt(
     headless: bool = False,
     no_tools: bool = False,
 ) -> str:
-    resolved = list(allowed_tools)
+    # The catalog only shows names and descriptions, so those stand in for the tool objects.
+    key = (
+        tuple(allowed_tools),
+        read_only,
+        yolo_enabled,
+        headless,
+        no_tools,
+        tuple((tool.name, tool.description) for tool in plugins or ()),
+        tuple((tool.name, tool.description) for tool in runtime_tools or ()),
+    )
+    prompt = _TOOL_PROMPT_CACHE.get(key)
+    if prompt is None:
+        prompt = _render_tool_prompt(key[0], read_only, yolo_enabled, plugins, runtime_tools, headless, no_tools)
+        if len(_TOOL_PROMPT_CACHE) >= _TOOL_PROMPT_CACHE_MAX:
+            _TOOL_PROMPT_CACHE.pop(next(iter(_TOOL_PROMPT_CACHE)))
+        _TOOL_PROMPT_CACHE[key] = prompt
+    return prompt
+
+
+def _render_tool_prompt(
+    resolved: Sequence[str],
+    read_only: bool,
+    yolo_enabled: bool,
+    plugins: Optional[Sequence[PluginTool]],
+    runtime_tools: Optional[Sequence[RuntimeTool]],
+    headless: bool,
+    no_tools: bool,
+) -> str:
     if no_tools:
-        prompt_lines = [
-            "You are an agent in a tool-using loop. Work autonomously until the user's request is done.",
-            "Return ONLY one JSON object in STRICT JSON (double quotes): {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]}",
-            "Do NOT wrap the JSON in Markdown/code fences; output must start with '{' and end with '}' with no extra text.",
-            "assistant_turn schema: {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]} (steps is a JSON list).",
-            "Steps: think | message | end. Tool use is disabled for this run; do NOT emit tool_call steps.",
-            "Think step: {\"type\":\"think\",\"content\":\"...\"} (content must be a non-empty string).",
-            "Ending rule: the session ends ONLY when you include an explicit end step; a message step (even purpose='final') does NOT end the loop.",
-            "Runtime control messages: treat role='user' content prefixed with 'LOOP:' as higher-priority instructions from the runtime (not the human).",
-            "Message purpose values: progress | clarification | cannot_finish | final (default: progress).",
-            "Message step: {\"type\":\"message\",\"purpose\":\"clarification\",\"format\":\"markdown\",\"content\":\"...\"}",
-            "End step: {\"type\":\"end\",\"reason\":\"completed\"} (reason optional; defaults to completed).",
-            "Example (finish): {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[{\"type\":\"message\",\"purpose\":\"final\",\"format\":\"markdown\",\"content\":\"...\"},{\"type\":\"end\",\"reason\":\"completed\"}]}",
-        ]
+        parts = [_NO_TOOLS_PROMPT]
     else:
         tool_catalog = _format_tool_catalog(resolved, plugins, runtime_tools=runtime_tools, include_usage=False)
-        tool_call_examples: List[str] = []
+        allowed_set = frozenset(resolved)
+        parts = [_TOOL_PROMPT_HEAD]
         if resolved:
-            example_tool = _pick_example_tool(resolved)
-            tool_call_v2 = {
-                "type": "assistant_turn",
-                "version": "2",
-                "steps": [{"type": "tool_call", "call": {**_example_call_v2(example_tool), "meta": {"timeout_s": 10}}}],
-            }
-            tool_call_examples = [
-                f"Tool call example (v2): {json.dumps(tool_call_v2, ensure_ascii=False)}",
-                "If you are unsure how to call a tool or what args it accepts, call tools_guide (or tools_list to discover tools).",
-            ]
-        prompt_lines = [
-            "You are an agent in a tool-using loop. Work autonomously until the user's request is done.",
-            "Return ONLY one JSON object in STRICT JSON (double quotes): {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]}",
-            "Do NOT wrap the JSON in Markdown/code fences; output must start with '{' and end with '}' with no extra text.",
-            "assistant_turn schema: {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[...]} (steps is a JSON list).",
-            "Steps: think | tool_call | message | end. Tool outputs are JSON with success + data/error.",
-            "Think step: {\"type\":\"think\",\"content\":\"...\"} (content must be a non-empty string).",
-            "Ending rule: the session ends ONLY when you include an explicit end step; a message step (even purpose='final') does NOT end the loop.",
-            "Runtime control messages: treat role='user' content prefixed with 'LOOP:' as higher-priority instructions from the runtime (not the human).",
-            "Message purpose values: progress | clarification | cannot_finish | final (default: progress).",
-            "Message step: {\"type\":\"message\",\"purpose\":\"clarification\",\"format\":\"markdown\",\"content\":\"...\"}",
-            "Tool call step (v2): {\"type\":\"tool_call\",\"call\":{\"tool\":\"<name>\",\"target\":\"\",\"args\":{...},\"meta\":{\"timeout_s\":10}}}",
-            "End step: {\"type\":\"end\",\"reason\":\"completed\"} (reason optional; defaults to completed).",
-            *tool_call_examples,
-            "Example (finish): {\"type\":\"assistant_turn\",\"version\":\"2\",\"steps\":[{\"type\":\"message\",\"purpose\":\"final\",\"format\":\"markdown\",\"content\":\"...\"},{\"type\":\"end\",\"reason\":\"completed\"}]}",
-            "Available tools (including plugins):",
-            tool_catalog,
-            "Paths are relative to the working directory; do not escape with .. or absolute paths.",
-            "Skills: only discuss/list skills when the user asks; call list_skills only on explicit user request (or if a requested skill needs a path); call skills_guide for skill format/rules.",
-        ]
-    prompt = "\n".join(prompt_lines)
-
-    if read_only and not no_tools:
-        prompt = (
-            f"{prompt}\nRead-only mode is enabled: destructive tools (write, mkdir, move) and plugins that disallow read-only are unavailable; requests for them will be rejected."
-        )
-    if "bash" in resolved and not yolo_enabled and not no_tools:
-        prompt = f"{prompt}\nNote: 'bash' prompts for confirmation on every command. Use only when necessary."
-    if yolo_enabled and not no_tools:
-        prompt = (
-            f"{prompt}\nYolo mode is enabled: tool runs are auto-approved (no per-call confirmations). "
-            "Path sandboxing is disabled for built-in tools; absolute paths are allowed."
-        )
+            parts.append(_tool_call_example_line(_pick_example_tool(resolved, allowed_set)))
+            parts.append(
+                "If you are unsure how to call a tool or what args it accepts, call tools_guide (or tools_list to discover tools)."
+            )
+        parts.extend((_TOOL_PROMPT_CATALOG_HEADER, tool_catalog, _TOOL_PROMPT_TAIL))
+        if read_only:
+            parts.append(_READ_ONLY_NOTE)
+        if "bash" in allowed_set and not yolo_enabled:
+            parts.append(_BASH_CONFIRM_NOTE)
+        if yolo_enabled:
+            parts.append(_YOLO_NOTE)
     if headless:
-        prompt = (
-            f"{prompt}\nHeadless mode is active: the user cannot respond during the run. "
-            "Do NOT ask questions or request confirmation. If information is missing, make reasonable assumptions, state them briefly, and proceed. "
-            "Only if you truly cannot proceed safely, send a message with purpose='cannot_finish' describing what's missing, then end."
-        )
-    return prompt
+        parts.append(_HEADLESS_NOTE)
+    return "\n".join(parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class NotesContext:
     repo_root: Path
     nearest_agents: Optional[Path]
-    repo_notes: str
-    user_notes: str
+    user_agents: Optional[Path]
     user_skills: Optional[Path]
-    discovered_skills: List[Tuple[str, Path]]
+    skill_roots: List[Path]
+    # Notes and the skill scan are computed on first access: the system prompt only uses them
+    # in --no-tools / debug runs.
+    _repo_notes: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _user_notes: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _discovered_skills: Optional[List[Tuple[str, Path]]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def repo_notes(self) -> str:
+        if self._repo_notes is None:
+            self._repo_notes = _read_notes(self.nearest_agents).strip()
+        return self._repo_notes
+
+    @property
+    def user_notes(self) -> str:
+        if self._user_notes is None:
+            self._user_notes = _read_notes(self.user_agents).strip()
+        return self._user_notes
+
+    @property
+    def discovered_skills(self) -> List[Tuple[str, Path]]:
+        if self._discovered_skills is None:
+            self._discovered_skills = _list_available_skills(self.skill_roots)
+        return self._discovered_skills
 
 
 def find_repo_root(start: Path) -> Path:
-    current = start
-    for parent in [current] + list(current.parents):
-        if (parent / ".git").exists():
-            return parent
-    return start
+    # Walk plain strings; a Path is only built for the answer. Not cached: the walk is a few
+    # stats, and a cached root would miss a nested `git init` below it.
+    current = str(start)
+    while True:
+        # exists(), not isdir(): worktrees and submodules use a .git file.
+        if os.path.exists(os.path.join(current, ".git")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return start
+        current = parent
 
 
 def find_nearest_agents(task_path: Path, stop_at: Path) -> Optional[Path]:
-    current = task_path
+    current = str(task_path)
+    stop = str(stop_at)
     while True:
-        candidate = current / "AGENTS.md"
-        if candidate.exists():
-            return candidate
-        if current == stop_at or current.parent == current:
+        candidate = os.path.join(current, "AGENTS.md")
+        if os.path.exists(candidate):
+            return Path(candidate)
+        parent = os.path.dirname(current)
+        if current == stop or parent == current:
             break
-        current = current.parent
+        current = parent
     return None
 
 
-def load_user_notes_and_skills() -> tuple[str, Optional[Path]]:
+# (path, mtime_ns, size) -> notes text; an edited file misses on its new stat and is re-read.
+_NOTES_CACHE: Dict[Tuple[str, int, int], str] = {}
+_NOTES_CACHE_MAX = 8
+
+
+def _read_notes(path: Optional[Path]) -> str:
+    if path is None:
+        return ""
+    try:
+        st = path.stat()
+    except OSError:
+        return ""
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    text = _NOTES_CACHE.get(key)
+    if text is not None:
+        return text
+    try:
+        text = path.read_text(encoding="utf-8")
+    except Exception:
+        return ""
+    if len(_NOTES_CACHE) >= _NOTES_CACHE_MAX:
+        _NOTES_CACHE.pop(next(iter(_NOTES_CACHE)))
+    _NOTES_CACHE[key] = text
+    return text
+
+
+def _user_paths() -> tuple[Path, Path]:
+    # Resolved per call: HOME (or a patched Path.home in tests) may change within a process.
     user_config_dir = Path.home() / ".config" / "agents"
-    user_agents = user_config_dir / "AGENTS.md"
-    user_skills = user_config_dir / "skills"
+    return user_config_dir / "AGENTS.md", user_config_dir / "skills"
 
-    notes = ""
-    if user_agents.exists():
-        try:
-            notes = user_agents.read_text(encoding="utf-8")
-        except Exception:
-            notes = ""
 
-    if user_skills.exists() and user_skills.is_dir():
-        return notes, user_skills
-    return notes, None
+def _find_user_agents_and_skills() -> tuple[Optional[Path], Optional[Path]]:
+    # One stat per path: exists() for the notes file, is_dir() (which covers existence) for skills.
+    user_agents, user_skills = _user_paths()
+    return (
+        user_agents if user_agents.exists() else None,
+        user_skills if user_skills.is_dir() else None,
+    )
+
+
+def load_user_notes_and_skills() -> tuple[str, Optional[Path]]:
+    user_agents, user_skills = _user_paths()
+    # _read_notes' stat doubles as the existence check: a missing file reads as "".
+    return _read_notes(user_agents), user_skills if user_skills.is_dir() else None
 
 
 def _list_available_skills(skill_roots: Sequence[Path]) -> List[Tuple[str, Path]]:
-    seen = set()
+    seen: set[Tuple[str, int, int]] = set()
     found: List[Tuple[str, Path]] = []
     for root in skill_roots:
-        if not root.exists() or not root.is_dir():
+        # DirEntry carries the file type from the directory read, so only real skills cost a stat.
+        try:
+            entries = os.scandir(root)
+        except OSError:
             continue
-        for candidate in root.iterdir():
-            if not candidate.is_dir():
-                continue
-            if (candidate / "SKILL.md").exists():
-                key = (candidate.name, str(candidate.resolve()))
+        with entries:
+            for entry in entries:
+                try:
+                    if not entry.is_dir():
+                        continue
+                except OSError:
+                    continue
+                if not os.path.exists(os.path.join(entry.path, "SKILL.md")):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                key = (entry.name, st.st_dev, st.st_ino)
                 if key in seen:
                     continue
                 seen.add(key)
-                found.append((candidate.name, candidate))
+                found.append((entry.name, root / entry.name))
     found.sort(key=lambda pair: pair[0])
     return found
 
@@ -238,26 +378,28 @@ def gather_context(workdir: Path) -> NotesContext:
     nearest_agents = find_nearest_agents(workdir, repo_root)
     skill_roots = [workdir / "skills"]
 
-    repo_notes = ""
-    if nearest_agents:
-        try:
-            repo_notes = nearest_agents.read_text(encoding="utf-8")
-        except Exception:
-            repo_notes = ""
-
-    user_notes, user_skills = load_user_notes_and_skills()
+    user_agents, user_skills = _find_user_agents_and_skills()
     if user_skills:
         skill_roots.append(user_skills)
     return NotesContext(
         repo_root=repo_root,
         nearest_agents=nearest_agents,
-        repo_notes=repo_notes.strip(),
-        user_notes=user_notes.strip(),
+        user_agents=user_agents,
         user_skills=user_skills,
-        discovered_skills=_list_available_skills(skill_roots),
+        skill_roots=skill_roots,
     )
 
 
+_STARTUP_NOTE = "\n".join(
+    [
+        "Startup: the runtime will call `policy` once before your first response and include the tool result.",
+        "Note: `policy` returns an excerpt by default; call it again with offset/limit (or truncate=false) to see more.",
+        "Call `skills_guide` only when the user asks about skills or requests skill creation/usage.",
+    ]
+)
+_NO_TOOLS_STARTUP_NOTE = "Tooling is disabled for this run; do not emit tool_call steps."
+
+
 def build_system_message(
     workdir: Path,
     notes: NotesContext,
@@ -295,18 +437,9 @@ def build_system_message(
             f"- Mode: {mode}; headless: {headless}.",
         ]
     )
-    startup_lines = []
-    if no_tools:
-        startup_lines.append("Tooling is disabled for this run; do not emit tool_call steps.")
-    else:
-        startup_lines.extend(
-            [
-                "Startup: the runtime will call `policy` once before your first response and include the tool result.",
-                "Note: `policy` returns an excerpt by default; call it again with offset/limit (or truncate=false) to see more.",
-                "Call `skills_guide` only when the user asks about skills or requests skill creation/usage.",
-            ]
-        )
-    content = f"{tool_prompt}\n" + "\n".join(startup_lines) + f"\n{startup_capsule}\n"
+    startup_note = _NO_TOOLS_STARTUP_NOTE if no_tools else _STARTUP_NOTE
+    # Fragments carry their own newlines and are joined once at the end.
+    parts = [tool_prompt, "\n", startup_note, "\n", startup_capsule, "\n"]
     if no_tools and notes.repo_notes:
         excerpt = notes.repo_notes
         truncated = False
@@ -317,27 +450,26 @@ def build_system_message(
             excerpt = excerpt[:limit]
             truncated = True
         trunc_note = " (truncated)" if truncated else ""
-        content = f"{content}\nRepository instructions (AGENTS.md){trunc_note}:\n{excerpt}\n"
+        parts.append(f"\nRepository instructions (AGENTS.md){trunc_note}:\n{excerpt}\n")
     if debug:
-        content = (
-            f"{content}"
+        parts.append(
             f"Working directory: {workdir}\n"
-            f"All tool paths are relative to this directory.\n"
+            "All tool paths are relative to this directory.\n"
             f"Repo root: {notes.repo_root}\n"
             f"Nearest AGENTS.md: {notes.nearest_agents if notes.nearest_agents else 'none'}\n"
         )
         if notes.discovered_skills:
             skills_lines = "\n".join(f"- {name}" for name, _path in notes.discovered_skills)
-            content = f"{content}\nSkills discovered at start (no tool call):\n{skills_lines}"
+            parts.append(f"\nSkills discovered at start (no tool call):\n{skills_lines}")
         else:
-            content = f"{content}\nSkills discovered at start: none found."
+            parts.append("\nSkills discovered at start: none found.")
 
         if notes.user_skills:
-            content = (
-                f"{content}\n\nUser skills directory: {notes.user_skills}\n"
+            parts.append(
+                f"\n\nUser skills directory: {notes.user_skills}\n"
                 "You may read/find/ls within this path alongside repo skills."
             )
 
     # Note: repo/user notes are intentionally not embedded in the system prompt to reduce context size.
 
-    return {"role": "system", "content": content}
+    return {"role": "system", "content": "".join(parts)}
@@ -1,12 +1,19 @@
 import json
+import os
 import tempfile
+import time
 from pathlib import Path
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from unittest.mock import patch
 
 from lmao.plugins import discover_plugins
 from lmao.tools import ToolCall, run_tool
-from lmao.async_jobs import get_async_job_manager
+from lmao.async_jobs import (
+    AsyncJobManager,
+    _direct_argv,
+    get_async_job_manager,
+    shutdown_all_jobs,
+)
 
 
 class AsyncToolsTests(TestCase):
@@ -17,6 +24,9 @@ class AsyncToolsTests(TestCase):
         self.plugins = discover_plugins([tools_dir], self.base, allow_outside_base=True)
 
     def tearDown(self) -> None:
+        manager = get_async_job_manager()
+        for job in manager.list_jobs():
+            manager.stop(job["id"])
         self.tmp.cleanup()
 
     def test_async_tail_and_poll(self) -> None:
@@ -128,3 +138,209 @@ class AsyncToolsTests(TestCase):
         )
         poll_payload = json.loads(poll_result)
         self.assertTrue(poll_payload["success"])
+
+
+class AsyncJobManagerTests(TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name).resolve()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_tail_picks_up_appends_between_polls(self) -> None:
+        manager = AsyncJobManager()
+        log_path = self.base / "app.log"
+        log_path.write_text("old\n", encoding="utf-8")
+        job_id = manager.start_tail(log_path, start_at="end")
+
+        first = manager.poll(job_id)
+        assert first is not None
+        self.assertEqual([], first["events"])
+
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("new1\nnew2\n")
+        second = manager.poll(job_id, since_seq=first["next_seq"] - 1)
+        assert second is not None
+        self.assertEqual(["new1", "new2"], [e["text"] for e in second["events"]])
+
+        third = manager.poll(job_id, since_seq=second["next_seq"] - 1)
+        assert third is not None
+        self.assertEqual([], third["events"])
+        manager.stop(job_id)
+
+    def test_tail_follows_truncated_file(self) -> None:
+        manager = AsyncJobManager()
+        log_path = self.base / "app.log"
+        log_path.write_text("first line\n", encoding="utf-8")
+        job_id = manager.start_tail(log_path, start_at="start")
+        first = manager.poll(job_id)
+        assert first is not None
+        self.assertEqual(["first line"], [e["text"] for e in first["events"]])
+
+        log_path.write_text("x\n", encoding="utf-8")
+        second = manager.poll(job_id, since_seq=first["next_seq"] - 1)
+        assert second is not None
+        self.assertEqual(["x"], [e["text"] for e in second["events"]])
+        manager.stop(job_id)
+
+    def test_event_buffer_evicts_oldest_and_slices_by_seq(self) -> None:
+        manager = AsyncJobManager(max_events=3, max_event_chars=1000)
+        log_path = self.base / "app.log"
+        log_path.write_text("".join(f"line{i}\n" for i in range(1, 6)), encoding="utf-8")
+        job_id = manager.start_tail(log_path, start_at="start")
+
+        everything = manager.poll(job_id)
+        assert everything is not None
+        self.assertEqual(6, everything["next_seq"])
+        self.assertEqual([3, 4, 5], [e["seq"] for e in everything["events"]])
+        self.assertEqual(["line3", "line4", "line5"], [e["text"] for e in everything["events"]])
+
+        tail = manager.poll(job_id, since_seq=4)
+        assert tail is not None
+        self.assertEqual(["line5"], [e["text"] for e in tail["events"]])
+        manager.stop(job_id)
+
+    def _wait_for_exit(self, manager: AsyncJobManager, job_id: str) -> dict:
+        deadline = time.time() + 10
+        while True:
+            payload = manager.poll(job_id)
+            assert payload is not None
+            if payload["status"] != "running" or time.time() > deadline:
+                return payload
+            time.sleep(0.02)
+
+    def test_bash_collects_stdout_lines_in_order(self) -> None:
+        manager = AsyncJobManager()
+        job_id = manager.start_bash("seq 1 200", cwd=self.base)
+        payload = self._wait_for_exit(manager, job_id)
+        self.assertEqual("done", payload["status"])
+        stdout = [e["text"] for e in payload["events"] if e["stream"] == "stdout"]
+        self.assertEqual([str(i) for i in range(1, 201)], stdout)
+
+    def test_bash_handles_crlf_and_unterminated_last_line(self) -> None:
+        manager = AsyncJobManager()
+        job_id = manager.start_bash("printf 'one\\r\\ntwo\\nthree'; printf 'err\\n' >&2", cwd=self.base)
+        payload = self._wait_for_exit(manager, job_id)
+        stdout = [e["text"] for e in payload["events"] if e["stream"] == "stdout"]
+        stderr = [e["text"] for e in payload["events"] if e["stream"] == "stderr"]
+        self.assertEqual(["one", "two", "three"], stdout)
+        self.assertEqual(["err"], stderr)
+
+    def test_concurrent_bash_jobs_share_io_and_finish(self) -> None:
+        manager = AsyncJobManager()
+        job_ids = [manager.start_bash(f"echo job{i}; exit {i}", cwd=self.base) for i in range(3)]
+        for i, job_id in enumerate(job_ids):
+            payload = self._wait_for_exit(manager, job_id)
+            self.assertEqual("done" if i == 0 else "error", payload["status"])
+            texts = [e["text"] for e in payload["events"]]
+            self.assertIn(f"job{i}", texts)
+            self.assertIn(f"process exited with code {i}", texts)
+
+    @skipIf(os.name == "nt", "argv exec is POSIX-only")
+    def test_simple_commands_skip_the_shell(self) -> None:
+        self.assertEqual(["seq", "1", "3"], _direct_argv("seq 1 3"))
+        for command in ("echo a | cat", "FOO=1 env", "cd /tmp", "./run.sh", "ls *.py", "echo $HOME", "echo 'a b'"):
+            self.assertIsNone(_direct_argv(command), command)
+
+    @skipIf(os.name == "nt", "exit code 127 is a POSIX shell convention")
+    def test_unknown_command_still_reports_shell_exit_code(self) -> None:
+        manager = AsyncJobManager()
+        job_id = manager.start_bash("definitely-not-a-real-command-xyz", cwd=self.base)
+        payload = self._wait_for_exit(manager, job_id)
+        self.assertEqual("error", payload["status"])
+        self.assertIn("process exited with code 127", [e["text"] for e in payload["events"]])
+
+    def test_stop_cancels_running_bash_job(self) -> None:
+        manager = AsyncJobManager()
+        job_id = manager.start_bash("sleep 30", cwd=self.base)
+        self.assertTrue(manager.stop(job_id))
+        job = manager.get_job(job_id)
+        assert job is not None and job.proc is not None
+        job.proc.wait(timeout=5)
+        payload = manager.poll(job_id)
+        assert payload is not None
+        self.assertEqual("canceled", payload["status"])
+
+    def test_thread_reader_fallback_collects_output(self) -> None:
+        manager = AsyncJobManager()
+        with patch("lmao.async_jobs._SELECTOR_IO", False):
+            job_id = manager.start_bash("printf 'a\\nb\\n'", cwd=self.base)
+        payload = self._wait_for_exit(manager, job_id)
+        self.assertEqual("done", payload["status"])
+        self.assertEqual(["a", "b"], [e["text"] for e in payload["events"] if e["stream"] == "stdout"])
+
+    def test_exit_polling_without_pidfd(self) -> None:
+        manager = AsyncJobManager()
+        with patch("lmao.async_jobs._open_pidfd", return_value=None):
+            job_id = manager.start_bash("echo polled", cwd=self.base)
+            payload = self._wait_for_exit(manager, job_id)
+        self.assertEqual("done", payload["status"])
+        self.assertIn("polled", [e["text"] for e in payload["events"]])
+
+    def test_tail_holds_partial_line_until_newline(self) -> None:
+        manager = AsyncJobManager()
+        log_path = self.base / "app.log"
+        log_path.write_text("", encoding="utf-8")
+        job_id = manager.start_tail(log_path, start_at="start")
+
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("par")
+        first = manager.poll(job_id)
+        assert first is not None
+        self.assertEqual([], first["events"])
+
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("tial\nnext\n")
+        second = manager.poll(job_id)
+        assert second is not None
+        self.assertEqual(["partial", "next"], [e["text"] for e in second["events"]])
+        manager.stop(job_id)
+
+    @skipIf(os.name == "nt", "process groups are POSIX-only")
+    def test_stop_signals_the_whole_process_group(self) -> None:
+        manager = AsyncJobManager()
+        job_id = manager.start_bash("sleep 30 & sleep 30; wait", cwd=self.base)
+        job = manager.get_job(job_id)
+        assert job is not None and job.proc is not None
+        time.sleep(0.2)
+        self.assertTrue(manager.stop(job_id))
+        job.proc.wait(timeout=5)
+        deadline = time.time() + 5
+        while True:
+            try:
+                os.killpg(job.proc.pid, 0)
+            except ProcessLookupError:
+                break
+            if time.time() > deadline:
+                self.fail("background child survived stop()")
+            time.sleep(0.05)
+
+    @skipIf(os.name == "nt", "process groups are POSIX-only")
+    def test_shutdown_kills_every_running_job(self) -> None:
+        manager = AsyncJobManager()
+        job_ids = [manager.start_bash("sleep 30 & sleep 30; wait", cwd=self.base) for _ in range(2)]
+        done_id = manager.start_bash("true", cwd=self.base)
+        self.assertEqual("done", self._wait_for_exit(manager, done_id)["status"])
+        time.sleep(0.2)
+
+        shutdown_all_jobs()
+
+        for job_id in job_ids:
+            job = manager.get_job(job_id)
+            assert job is not None and job.proc is not None
+            job.proc.wait(timeout=5)
+            self.assertEqual("canceled", self._wait_for_exit(manager, job_id)["status"])
+            self._assert_group_gone(job.proc.pid)
+        self.assertEqual("done", self._wait_for_exit(manager, done_id)["status"])
+
+    def _assert_group_gone(self, pgid: int) -> None:
+        deadline = time.time() + 5
+        while True:
+            try:
+                os.killpg(pgid, 0)
+            except ProcessLookupError:
+                return
+            if time.time() > deadline:
+                self.fail("process group survived")
+            time.sleep(0.05)
@@ -10,8 +10,8 @@ from lmao.config import ConfigLoadResult, UserConfig
 
 
 class CLIHeadlessTests(TestCase):
-    @patch("lmao.cli.run_loop")
-    @patch("lmao.cli.LLMClient")
+    @patch("lmao.loop.run_loop")
+    @patch("lmao.llm.LLMClient")
     def test_headless_without_prompt_errors(self, client_cls, run_loop):
         config_result = ConfigLoadResult(Path("lmao.conf"), UserConfig(), None, True)
         with patch("sys.argv", ["lmao", "--headless"]), patch(
@@ -25,8 +25,8 @@ class CLIHeadlessTests(TestCase):
             self.assertEqual(2, exc.exception.code)
         run_loop.assert_not_called()
 
-    @patch("lmao.cli.run_loop")
-    @patch("lmao.cli.LLMClient")
+    @patch("lmao.loop.run_loop")
+    @patch("lmao.llm.LLMClient")
     def test_config_headless_default_prompt_used(self, client_cls, run_loop):
         config = UserConfig(default_prompt="stored prompt", headless=True)
         config_result = ConfigLoadResult(Path("lmao.conf"), config, None, True)
@@ -10,8 +10,8 @@ from lmao.config import ConfigLoadResult, UserConfig
 
 
 class CLIModeOptionsTests(TestCase):
-    @patch("lmao.cli.run_loop")
-    @patch("lmao.cli.LLMClient")
+    @patch("lmao.loop.run_loop")
+    @patch("lmao.llm.LLMClient")
     def test_conflicting_mode_and_yolo_flags_error(self, client_cls, run_loop) -> None:
         config_result = ConfigLoadResult(Path("lmao.conf"), UserConfig(), None, True)
         with patch("sys.argv", ["lmao", "--mode", "yolo", "--yolo"]), patch(
@@ -25,8 +25,8 @@ class CLIModeOptionsTests(TestCase):
             self.assertEqual(2, exc.exception.code)
         run_loop.assert_not_called()
 
-    @patch("lmao.cli.run_loop")
-    @patch("lmao.cli.LLMClient")
+    @patch("lmao.loop.run_loop")
+    @patch("lmao.llm.LLMClient")
     def test_yolo_deprecated_warns_and_runs(self, client_cls, run_loop) -> None:
         config_result = ConfigLoadResult(Path("lmao.conf"), UserConfig(), None, True)
         with patch("sys.argv", ["lmao", "--yolo", "--headless", "prompt"]), patch(
@@ -43,8 +43,8 @@ class CLIModeOptionsTests(TestCase):
                 for record in captured
             )
         )
-    @patch("lmao.cli.run_loop")
-    @patch("lmao.cli.LLMClient")
+    @patch("lmao.loop.run_loop")
+    @patch("lmao.llm.LLMClient")
     def test_free_flag_rejects_non_openrouter(self, client_cls, run_loop) -> None:
         config_result = ConfigLoadResult(Path("lmao.conf"), UserConfig(), None, True)
         with patch("sys.argv", ["lmao", "--provider", "lmstudio", "--free"]), patch(
@@ -58,8 +58,8 @@ class CLIModeOptionsTests(TestCase):
             self.assertEqual(2, exc.exception.code)
         run_loop.assert_not_called()
 
-    @patch("lmao.cli.run_loop")
-    @patch("lmao.cli.LLMClient")
+    @patch("lmao.loop.run_loop")
+    @patch("lmao.llm.LLMClient")
     def test_quiet_and_no_tools_flags(self, client_cls, run_loop) -> None:
         config_result = ConfigLoadResult(Path("lmao.conf"), UserConfig(), None, True)
         with patch(
@@ -74,3 +74,29 @@ class CLIModeOptionsTests(TestCase):
         kwargs = run_loop.call_args[1]
         self.assertTrue(kwargs["quiet"])
         self.assertTrue(kwargs["no_tools"])
+
+    @patch("lmao.loop.run_loop")
+    @patch("lmao.llm.LLMClient")
+    def test_lmstudio_env_defaults_are_read_at_run_time(self, client_cls, run_loop) -> None:
+        config_result = ConfigLoadResult(Path("lmao.conf"), UserConfig(), None, True)
+        env = {"LM_STUDIO_URL": "http://env-lm/v1", "LM_STUDIO_MODEL": "env-model"}
+        with patch("sys.argv", ["lmao", "--headless", "prompt"]), patch(
+            "lmao.cli.load_user_config",
+            return_value=config_result,
+        ), patch.dict("os.environ", env):
+            main()
+        kwargs = client_cls.call_args[1]
+        self.assertEqual("http://env-lm/v1", kwargs["endpoint"])
+        self.assertEqual("env-model", kwargs["model"])
+
+    @patch("lmao.async_jobs.shutdown_all_jobs")
+    @patch("lmao.loop.run_loop", side_effect=KeyboardInterrupt)
+    @patch("lmao.llm.LLMClient")
+    def test_interrupt_shuts_down_async_jobs(self, client_cls, run_loop, shutdown_all_jobs) -> None:
+        config_result = ConfigLoadResult(Path("lmao.conf"), UserConfig(), None, True)
+        with patch("sys.argv", ["lmao", "--headless", "prompt"]), patch(
+            "lmao.cli.load_user_config",
+            return_value=config_result,
+        ), contextlib.redirect_stderr(io.StringIO()):
+            main()
+        shutdown_all_jobs.assert_called_once_with()
@@ -1,3 +1,5 @@
+import configparser
+import dataclasses
 import os
 import tempfile
 from pathlib import Path
@@ -5,7 +7,8 @@ from unittest import TestCase
 from unittest.mock import patch
 
 from lmao.config import (
-    DEFAULT_CONFIG_TEMPLATE,
+    _FIELDS,
+    _default_config_template,
     load_user_config,
     resolve_default_config_path,
     resolve_openrouter_api_key,
@@ -97,6 +100,75 @@ log_path = /tmp/lmao-debug.log
         self.assertFalse(cfg.policy_truncate)
         self.assertEqual(9000, cfg.policy_truncate_chars)
 
+    def test_load_config_follows_ini_rules(self) -> None:
+        content = """
+; full-line comment
+[openrouter]
+API_KEY = abc#123 ;kept
+free_blacklist =
+    model-a
+    model-b
+endpoint: https://or.example/api
+"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "lmao.conf"
+            path.write_text(content, encoding="utf-8")
+            cfg = load_user_config(path).config
+            self.assertEqual("abc#123 ;kept", cfg.openrouter_api_key)
+            self.assertEqual(("model-a", "model-b"), cfg.openrouter_free_blacklist)
+            self.assertEqual("https://or.example/api", cfg.openrouter_endpoint)
+
+            for malformed in ("provider = lmstudio\n", "[core]\nmode = yolo\nmode = ro\n", "[core]\nnot an option\n"):
+                path.write_text(malformed, encoding="utf-8")
+                result = load_user_config(path)
+                self.assertFalse(result.loaded)
+                self.assertIsNotNone(result.error)
+                self.assertTrue(result.error.startswith("Failed to read config file: "), result.error)
+
+    def test_load_config_reads_indented_options_and_defaults(self) -> None:
+        content = """
+[DEFAULT]
+max_tokens = 512
+[core]
+  mode = normal
+  provider = lmstudio
+[generation]
+temperature = 0.5
+[openrouter]
+free_blacklist = model-a
+
+    model-b
+"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "lmao.conf"
+            path.write_text(content, encoding="utf-8")
+            result = load_user_config(path)
+        self.assertTrue(result.loaded, result.error)
+        cfg = result.config
+        self.assertEqual("normal", cfg.mode)
+        self.assertEqual("lmstudio", cfg.provider)
+        self.assertEqual(512, cfg.max_tokens)
+        self.assertEqual(0.5, cfg.temperature)
+        self.assertEqual(("model-a", "model-b"), cfg.openrouter_free_blacklist)
+
+    def test_load_config_keeps_configparser_semantics(self) -> None:
+        content = "[openrouter] trailing\napi_key = sk-ab%%cd\nendpoint = %(api_key)s/x\n"
+        parser = configparser.ConfigParser()
+        parser.read_string(content)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "lmao.conf"
+            path.write_text(content, encoding="utf-8")
+            cfg = load_user_config(path).config
+        self.assertEqual("sk-ab%cd", cfg.openrouter_api_key)
+        self.assertEqual(parser.get("openrouter", "api_key"), cfg.openrouter_api_key)
+        self.assertEqual(parser.get("openrouter", "endpoint"), cfg.openrouter_endpoint)
+
+    def test_field_table_covers_user_config(self) -> None:
+        self.assertEqual(
+            sorted(field.name for field in dataclasses.fields(UserConfig)),
+            sorted(name for name, _section, _option, _reader in _FIELDS),
+        )
+
     def test_resolve_provider_settings_precedence(self) -> None:
         env = {
             "LM_STUDIO_URL": "http://env-lm",
@@ -209,10 +281,13 @@ log_path = /tmp/lmao-debug.log
         with patch.dict(os.environ, {"XDG_CONFIG_HOME": "/tmp/xdg"}, clear=False):
             path = resolve_default_config_path()
             self.assertEqual(Path("/tmp/xdg/agents/lmao.conf"), path)
+            self.assertIs(path, resolve_default_config_path())
+        with patch.dict(os.environ, {"XDG_CONFIG_HOME": "/tmp/other"}, clear=False):
+            self.assertEqual(Path("/tmp/other/agents/lmao.conf"), resolve_default_config_path())
 
     def test_write_default_config_creates_template_once(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "agents" / "lmao.conf"
             self.assertTrue(write_default_config(path))
-            self.assertEqual(DEFAULT_CONFIG_TEMPLATE, path.read_text(encoding="utf-8"))
+            self.assertEqual(_default_config_template(), path.read_text(encoding="utf-8"))
             self.assertFalse(write_default_config(path))
@@ -1,9 +1,11 @@
+import os
 import tempfile
 from pathlib import Path
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from unittest.mock import patch
 
 from lmao import context
+from lmao.runtime_tools import RuntimeTool
 
 
 class ContextDiscoveryTests(TestCase):
@@ -32,7 +34,80 @@ class ContextDiscoveryTests(TestCase):
         self.assertEqual("", notes.user_notes)
         self.assertIsNone(notes.user_skills)
 
+    def test_gather_context_defers_reading_notes(self) -> None:
+        (self.base / ".git").mkdir()
+        agents_file = self.base / "AGENTS.md"
+        agents_file.write_text("before", encoding="utf-8")
+        user_dir = self.base / "home" / ".config" / "agents"
+        user_dir.mkdir(parents=True)
+        (user_dir / "AGENTS.md").write_text(" user notes \n", encoding="utf-8")
+
+        with patch("pathlib.Path.home", return_value=self.base / "home"):
+            notes = context.gather_context(self.base)
+        agents_file.write_text("after", encoding="utf-8")
+
+        self.assertEqual(user_dir / "AGENTS.md", notes.user_agents)
+        self.assertEqual("after", notes.repo_notes)
+        self.assertEqual("user notes", notes.user_notes)
+
+    def test_gather_context_scans_skills_on_first_access(self) -> None:
+        with patch("pathlib.Path.home", return_value=self.base / "home"):
+            notes = context.gather_context(self.base)
+        skill_dir = self.base / "skills" / "late"
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text("late", encoding="utf-8")
+
+        self.assertEqual([self.base / "skills"], notes.skill_roots)
+        self.assertEqual([("late", skill_dir)], notes.discovered_skills)
+
+    def test_load_user_notes_rereads_after_change(self) -> None:
+        user_dir = self.base / ".config" / "agents"
+        user_dir.mkdir(parents=True)
+        notes_file = user_dir / "AGENTS.md"
+        notes_file.write_text("first", encoding="utf-8")
+
+        with patch("pathlib.Path.home", return_value=self.base):
+            self.assertEqual(("first", None), context.load_user_notes_and_skills())
+            notes_file.write_text("second version", encoding="utf-8")
+            self.assertEqual(("second version", None), context.load_user_notes_and_skills())
+            notes_file.unlink()
+            self.assertEqual(("", None), context.load_user_notes_and_skills())
+
+    def test_find_repo_root_returns_nearest_git_ancestor(self) -> None:
+        nested = self.base / "a" / "b"
+        nested.mkdir(parents=True)
+        (self.base / ".git").mkdir()
+        self.assertEqual(self.base, context.find_repo_root(nested))
+
+        (self.base / "a" / ".git").write_text("gitdir: elsewhere\n", encoding="utf-8")
+        self.assertEqual(self.base / "a", context.find_repo_root(nested))
+
+    @skipIf(os.name == "nt", "directory symlinks need extra privileges on Windows")
+    def test_list_available_skills_dedupes_same_directory(self) -> None:
+        skills = self.base / "skills"
+        (skills / "alpha").mkdir(parents=True)
+        (skills / "alpha" / "SKILL.md").write_text("alpha", encoding="utf-8")
+        (skills / "notes").mkdir()
+        alias_root = self.base / "alias"
+        alias_root.symlink_to(skills, target_is_directory=True)
+
+        found = context._list_available_skills([skills, alias_root])
+
+        self.assertEqual([("alpha", skills / "alpha")], found)
+
     def test_build_tool_prompt_mentions_headless(self) -> None:
         prompt = context.build_tool_prompt([], read_only=False, headless=True)
         self.assertIn("Headless mode is active", prompt)
         self.assertIn("purpose='cannot_finish'", prompt)
+
+    def test_build_tool_prompt_is_cached_per_tool_descriptions(self) -> None:
+        tools = [RuntimeTool(name="probe", description="first")]
+        prompt = context.build_tool_prompt(["probe"], read_only=False, runtime_tools=tools)
+        self.assertIn("- probe: first", prompt)
+        self.assertIs(prompt, context.build_tool_prompt(["probe"], read_only=False, runtime_tools=tools))
+
+        changed = context.build_tool_prompt(
+            ["probe"], read_only=False, runtime_tools=[RuntimeTool(name="probe", description="second")]
+        )
+        self.assertIn("- probe: second", changed)
+        self.assertIn("Read-only mode", context.build_tool_prompt(["probe"], read_only=True, runtime_tools=tools))